@@ -3,6 +3,7 @@ GST Agent - LLM-Powered Validator with RAG
 Uses LangChain + RAG to validate GST compliance
 """
 
+import re
 from typing import Dict, List
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
@@ -13,6 +14,10 @@ from rag.gst_rag import GSTRegulationsRAG
 from utils.data_loaders import GSTRateSchedule, HSNSACMaster
 
 
+# Keywords indicating complex supplies (matched as substrings of lowercased descriptions)
+_COMPLEX_KEYWORDS_RE = re.compile(r'transport|warehouse|packing|composite|bundle')
+
+
 class GSTAgentLLM:
     """
     LLM-powered GST validation agent
@@ -75,7 +80,8 @@ Be thorough but concise. Focus on compliance issues."""),
         checks.extend(await self._validate_tax_calculations(invoice_data))
 
         # 3. LLM-powered checks for complex cases
-        if self._needs_llm_reasoning(invoice_data):
+        llm_used = self._needs_llm_reasoning(invoice_data)
+        if llm_used:
             llm_checks = await self._llm_reasoning_checks(invoice_data)
             checks.extend(llm_checks)
 
@@ -85,7 +91,7 @@ Be thorough but concise. Focus on compliance issues."""),
             "category_name": "GST Compliance",
             "checks": checks,
             "agent_type": "llm_powered",
-            "llm_used": self._needs_llm_reasoning(invoice_data)
+            "llm_used": llm_used
         }
 
     async def _validate_tax_calculations(self, invoice_data: Dict) -> List[Dict]:
@@ -420,14 +426,11 @@ Be thorough but concise. Focus on compliance issues."""),
         if invoice_data.get('reverse_charge', False):
             return True
 
-        # Check for keywords indicating complex cases
-        descriptions = [item.get('description', '').lower() for item in line_items]
-        complex_keywords = ['transport', 'warehouse', 'packing', 'composite', 'bundle']
-
-        if any(keyword in desc for desc in descriptions for keyword in complex_keywords):
-            return True
-
-        return False
+        # Check for keywords indicating complex cases (stops at the first match)
+        return any(
+            _COMPLEX_KEYWORDS_RE.search(item.get('description', '').lower())
+            for item in line_items
+        )
 
     async def _llm_reasoning_checks(self, invoice_data: Dict) -> List[Dict]:
         """LLM-powered checks for complex cases"""
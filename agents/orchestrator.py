@@ -209,47 +209,48 @@ class OrchestratorAgent:
         
         return should_escalate, reasons
     
-    async def process_batch(self, invoices: List[InvoiceData]) -> Dict:
+    async def process_batch(self, invoices: List[InvoiceData], concurrency: int = 8) -> Dict:
         """
-        Process multiple invoices
+        Process multiple invoices concurrently
+        
+        At most `concurrency` invoices are in flight at once so LLM
+        backends are not flooded. Results keep the input order.
         
         Returns summary statistics
         """
         
         print(f"\n📦 Processing batch of {len(invoices)} invoices...\n")
         
-        results = []
-        for invoice in invoices:
-            result = await self.process_invoice(invoice)
-            results.append(result)
+        semaphore = asyncio.Semaphore(concurrency)
         
-        # Calculate batch statistics
-        successful = len([r for r in results if r['status'] == 'success'])
-        escalated = len([r for r in results if r.get('escalated', False)])
+        async def process_one(invoice: InvoiceData) -> Dict:
+            async with semaphore:
+                return await self.process_invoice(invoice)
         
-        total_checks = sum([
-            len([
-                check
-                for category in r['validation_result'].category_results.values()
-                for check in category.checks
-            ])
-            for r in results if r['validation_result']
-        ])
+        # process_invoice never raises; failures come back as 'failed' results
+        results = await asyncio.gather(*(process_one(invoice) for invoice in invoices))
         
-        passed_checks = sum([
-            r['validation_result'].passed_checks
-            for r in results if r['validation_result']
-        ])
-        
-        avg_confidence = sum([
-            r['validation_result'].average_confidence
-            for r in results if r['validation_result']
-        ]) / len(results) if results else 0
+        # Calculate batch statistics in a single pass over the results
+        successful = escalated = total_checks = passed_checks = 0
+        confidence_sum = time_sum = 0.0
+        for r in results:
+            if r['status'] == 'success':
+                successful += 1
+            if r.get('escalated', False):
+                escalated += 1
+            time_sum += r.get('processing_time_ms', 0)
+            
+            validation_result = r['validation_result']
+            if validation_result:
+                total_checks += sum(
+                    len(category.checks)
+                    for category in validation_result.category_results.values()
+                )
+                passed_checks += validation_result.passed_checks
+                confidence_sum += validation_result.average_confidence
         
-        avg_time = sum([
-            r.get('processing_time_ms', 0)
-            for r in results
-        ]) / len(results) if results else 0
+        avg_confidence = confidence_sum / len(results) if results else 0
+        avg_time = time_sum / len(results) if results else 0
         
         return {
             'total_invoices': len(invoices),
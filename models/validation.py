@@ -2,7 +2,7 @@
 Validation result models
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from enum import Enum
 from datetime import datetime
@@ -23,7 +23,9 @@ class Severity(str, Enum):
 
 
 class CheckResult(BaseModel):
-    """Result of a single validation check"""
+    """Result of a single validation check (immutable once created)"""
+    model_config = ConfigDict(frozen=True)
+    
     check_id: str
     check_name: str
     status: CheckStatus
@@ -0,0 +1,236 @@
+"""
+Shared RAG machinery for regulation knowledge bases
+Vector store setup, retrieval and context formatting used by the GST and TDS RAGs
+"""
+
+import functools
+import os
+from typing import List, Dict, Optional
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from langchain_community.vectorstores import Chroma
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+
+
+# Open vector stores keyed by absolute persist directory, shared by all instances
+_VECTORSTORES: Dict[str, Chroma] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_embeddings() -> OpenAIEmbeddings:
+    """Single embeddings client reused by every RAG instance"""
+    return OpenAIEmbeddings(model="text-embedding-3-small")
+
+
+class _RegulationsRAG:
+    """
+    Base RAG system for a regulation knowledge base
+    
+    Subclasses only supply data: the knowledge documents, chunking
+    parameters and how retrieved documents are labelled in LLM context.
+    """
+    
+    PERSIST_DIRECTORY: str = ""
+    KNOWLEDGE: List[Dict] = []
+    CHUNK_SIZE: int = 1000
+    CHUNK_OVERLAP: int = 200
+    DEFAULT_K: int = 4
+    CONTEXT_HEADER: str = "[Regulation {index} - {source}]"
+    NO_CONTEXT_MESSAGE: str = "No relevant regulations found."
+    
+    def __init__(self, persist_directory: Optional[str] = None):
+        self.persist_directory = persist_directory or self.PERSIST_DIRECTORY
+        self.embeddings = _shared_embeddings()
+        
+        # Reuse a vector store already opened for this directory
+        cache_key = os.path.abspath(self.persist_directory)
+        self.vectorstore = _VECTORSTORES.get(cache_key)
+        if self.vectorstore is not None:
+            return
+        
+        # Try to load existing vector store
+        if os.path.exists(self.persist_directory):
+            self.vectorstore = Chroma(
+                persist_directory=self.persist_directory,
+                embedding_function=self.embeddings
+            )
+        else:
+            # Create new and populate with the knowledge base
+            self._initialize_knowledge_base()
+        
+        _VECTORSTORES[cache_key] = self.vectorstore
+    
+    def _initialize_knowledge_base(self):
+        """Initialize vector store with the regulation documents"""
+        
+        documents = self._get_documents()
+        
+        # Split documents
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.CHUNK_SIZE,
+            chunk_overlap=self.CHUNK_OVERLAP,
+            length_function=len,
+        )
+        
+        splits = text_splitter.split_documents(documents)
+        
+        # Create vector store
+        self.vectorstore = Chroma.from_documents(
+            documents=splits,
+            embedding=self.embeddings,
+            persist_directory=self.persist_directory
+        )
+    
+    def _get_documents(self) -> List[Document]:
+        """Get regulation documents from the knowledge base"""
+        
+        return [
+            Document(
+                page_content=doc["content"],
+                metadata=doc["metadata"]
+            )
+            for doc in self.KNOWLEDGE
+        ]
+    
+    def retrieve(self, query: str, k: Optional[int] = None) -> List[Document]:
+        """
+        Retrieve relevant regulation documents
+        
+        Args:
+            query: Search query
+            k: Number of documents to retrieve (defaults to DEFAULT_K)
+            
+        Returns:
+            List of relevant documents
+        """
+        if not self.vectorstore:
+            return []
+        
+        return self.vectorstore.similarity_search(query, k=k or self.DEFAULT_K)
+    
+    def retrieve_with_scores(self, query: str, k: Optional[int] = None) -> List[tuple]:
+        """
+        Retrieve documents with relevance scores
+        
+        Returns:
+            List of (document, score) tuples
+        """
+        if not self.vectorstore:
+            return []
+        
+        return self.vectorstore.similarity_search_with_score(query, k=k or self.DEFAULT_K)
+    
+    def retrieve_mmr(self, query: str, k: Optional[int] = None, fetch_k: int = 20,
+                     lambda_mult: float = 0.5) -> List[Document]:
+        """
+        Retrieve diverse documents using Maximal Marginal Relevance
+        
+        Args:
+            query: Search query
+            k: Number of documents to return (defaults to DEFAULT_K)
+            fetch_k: Number of nearest candidates to re-rank
+            lambda_mult: 1.0 favours relevance only, 0.0 diversity only
+            
+        Returns:
+            List of relevant, mutually diverse documents
+        """
+        if not self.vectorstore:
+            return []
+        
+        query_embedding = self.embeddings.embed_query(query)
+        candidates = self.vectorstore._collection.query(
+            query_embeddings=[query_embedding],
+            n_results=fetch_k,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        
+        texts = candidates["documents"][0]
+        if not texts:
+            return []
+        
+        # Embeddings are stored as float32; keep that precision for re-ranking
+        selected = _mmr_select(
+            np.asarray(query_embedding, dtype=np.float32),
+            np.asarray(candidates["embeddings"][0], dtype=np.float32),
+            k=k or self.DEFAULT_K,
+            lambda_mult=lambda_mult
+        )
+        metadatas = candidates["metadatas"][0]
+        
+        return [
+            Document(page_content=texts[i], metadata=metadatas[i] or {})
+            for i in selected
+        ]
+    
+    def get_context(self, query: str, k: int = 3) -> str:
+        """
+        Get formatted context string for LLM
+        
+        Args:
+            query: Search query
+            k: Number of documents
+            
+        Returns:
+            Formatted context string
+        """
+        docs = self.retrieve(query, k=k)
+        
+        if not docs:
+            return self.NO_CONTEXT_MESSAGE
+        
+        return "\n".join(
+            f"{self._context_header(i, doc)}\n{doc.page_content}\n"
+            for i, doc in enumerate(docs, 1)
+        )
+    
+    def _context_header(self, index: int, doc: Document) -> str:
+        """Label a retrieved document in the LLM context"""
+        return self.CONTEXT_HEADER.format(
+            index=index,
+            source=doc.metadata.get('source', 'Unknown'),
+            section=doc.metadata.get('section', 'Unknown')
+        )
+    
+    def add_documents(self, documents: List[Document]):
+        """Add new documents to the vector store"""
+        if self.vectorstore:
+            self.vectorstore.add_documents(documents)
+    
+    def clear(self):
+        """Clear the vector store"""
+        _VECTORSTORES.pop(os.path.abspath(self.persist_directory), None)
+        if os.path.exists(self.persist_directory):
+            import shutil
+            shutil.rmtree(self.persist_directory)
+            self.vectorstore = None
+
+
+def _mmr_select(query_embedding: np.ndarray, candidate_embeddings: np.ndarray,
+                k: int, lambda_mult: float) -> List[int]:
+    """
+    Pick candidate indices by Maximal Marginal Relevance
+    
+    All query and pairwise similarities are computed up front as matrix
+    products; each selection round is then a masked argmax over arrays.
+    """
+    candidates = candidate_embeddings / np.linalg.norm(candidate_embeddings, axis=1, keepdims=True)
+    query = query_embedding / np.linalg.norm(query_embedding)
+    
+    query_similarity = candidates @ query
+    pairwise_similarity = candidates @ candidates.T
+    
+    redundancy = np.zeros(len(candidates), dtype=query_similarity.dtype)
+    available = np.ones(len(candidates), dtype=bool)
+    selected = []
+    
+    for _ in range(min(k, len(candidates))):
+        scores = lambda_mult * query_similarity - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, pairwise_similarity[best])
+    
+    return selected
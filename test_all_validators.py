@@ -8,16 +8,26 @@ This script validates an invoice using all available validators:
 
 Usage:
     python test_all_validators.py [invoice_id]
+    python test_all_validators.py --all [--concurrency N]
     
     Default: INV-2024-0001
     Example: python test_all_validators.py INV-2024-0002
 """
 
+import argparse
 import asyncio
+import functools
 import json
 import sys
 from datetime import date
 from pathlib import Path
+from types import MappingProxyType
+from typing import List, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is unavailable
+    orjson = None
 
 from models.invoice import InvoiceData, LineItem
 from validators.arithmetic_validator import ArithmeticValidator
@@ -25,34 +35,110 @@ from validators.gst_validator import GSTComplianceValidator
 from validators.vendor_validator import VendorValidator
 
 
+# GST state codes (first two digits of a GSTIN) -> state name
+STATE_MAP: Mapping[str, str] = MappingProxyType({
+    '01': 'Jammu and Kashmir',
+    '02': 'Himachal Pradesh',
+    '03': 'Punjab',
+    '04': 'Chandigarh',
+    '05': 'Uttarakhand',
+    '06': 'Haryana',
+    '07': 'Delhi',
+    '08': 'Rajasthan',
+    '09': 'Uttar Pradesh',
+    '10': 'Bihar',
+    '11': 'Sikkim',
+    '12': 'Arunachal Pradesh',
+    '13': 'Nagaland',
+    '14': 'Manipur',
+    '15': 'Mizoram',
+    '16': 'Tripura',
+    '17': 'Meghalaya',
+    '18': 'Assam',
+    '19': 'West Bengal',
+    '20': 'Jharkhand',
+    '21': 'Odisha',
+    '22': 'Chhattisgarh',
+    '23': 'Madhya Pradesh',
+    '24': 'Gujarat',
+    '26': 'Dadra and Nagar Haveli and Daman and Diu',
+    '27': 'Maharashtra',
+    '29': 'Karnataka',
+    '30': 'Goa',
+    '31': 'Lakshadweep',
+    '32': 'Kerala',
+    '33': 'Tamil Nadu',
+    '34': 'Puducherry',
+    '35': 'Andaman and Nicobar Islands',
+    '36': 'Telangana',
+    '37': 'Andhra Pradesh',
+    '38': 'Ladakh',
+})
+
+# Same table indexed by the integer state code for the per-invoice lookup
+_STATE_BY_CODE: List[Optional[str]] = [None] * 100
+for _code, _state in STATE_MAP.items():
+    _STATE_BY_CODE[int(_code)] = _state
+
+
+DATA_FILE = Path("data/test_invoices.json")
+
+_STATUS_SYMBOL = MappingProxyType({
+    'PASS': '✓',
+    'FAIL': '✗',
+    'WARNING': '⚠',
+    'SKIPPED': '○'
+})
+
+# Only emit ANSI colors to an interactive terminal, not to pipes or CI logs
+USE_COLOR = sys.stdout.isatty()
+
+_STATUS_COLOR = MappingProxyType({
+    'PASS': "\033[92m",    # Green
+    'FAIL': "\033[91m",    # Red
+    'WARNING': "\033[93m", # Yellow
+    'SKIPPED': "\033[90m"  # Gray
+} if USE_COLOR else {})
+
+_RESET_COLOR = "\033[0m" if USE_COLOR else ""
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@functools.lru_cache(maxsize=1)
+def _load_all_invoices(mtime_ns: int) -> dict:
+    """Parse the test invoice file once per modification time, indexed by invoice_id"""
+    
+    invoices = _json_loads(DATA_FILE.read_bytes())
+    
+    return {inv['invoice_id']: inv for inv in invoices}
+
+
 def load_test_invoice(invoice_id: str = "INV-2024-0001"):
     """Load test invoice from JSON"""
     
-    data_file = Path("data/test_invoices.json")
-    
-    if not data_file.exists():
-        print(f"❌ Error: {data_file} not found!")
+    if not DATA_FILE.exists():
+        print(f"❌ Error: {DATA_FILE} not found!")
         print("Make sure you're running this from the project root directory.")
         return None
     
-    with open(data_file) as f:
-        invoices = json.load(f)
-    
-    # Find the invoice
-    invoice_json = None
-    for inv in invoices:
-        if inv['invoice_id'] == invoice_id:
-            invoice_json = inv
-            break
+    invoices = _load_all_invoices(DATA_FILE.stat().st_mtime_ns)
+    invoice_json = invoices.get(invoice_id)
     
     if not invoice_json:
         print(f"❌ Error: Invoice {invoice_id} not found!")
-        print(f"Available invoices: {[inv['invoice_id'] for inv in invoices[:5]]}...")
+        print(f"Available invoices: {list(invoices)[:5]}...")
         return None
     
     return invoice_json
 
 
+def _state_from_gstin(gstin: str) -> Optional[str]:
+    """Resolve the state name from a GSTIN's two-digit state code"""
+    code = gstin[:2]
+    return _STATE_BY_CODE[int(code)] if code.isdecimal() else None
+
+
 def convert_to_model(invoice_json: dict) -> InvoiceData:
     """Convert JSON to Pydantic model"""
     
@@ -60,19 +146,10 @@ def convert_to_model(invoice_json: dict) -> InvoiceData:
     line_items = [LineItem(**item) for item in invoice_json['line_items']]
     
     # Determine seller state from GSTIN
-    seller_state_code = invoice_json['vendor']['gstin'][:2]
-    state_map = {
-        '27': 'Maharashtra',
-        '07': 'Delhi',
-        '29': 'Karnataka',
-        '33': 'Tamil Nadu',
-        '09': 'Uttar Pradesh'
-    }
-    seller_state = state_map.get(seller_state_code, None)
+    seller_state = _state_from_gstin(invoice_json['vendor']['gstin'])
     
     # Determine buyer state
-    buyer_state_code = invoice_json['buyer']['gstin'][:2]
-    buyer_state = state_map.get(buyer_state_code, None)
+    buyer_state = _state_from_gstin(invoice_json['buyer']['gstin'])
     
     # Create invoice data
     invoice = InvoiceData(
@@ -126,23 +203,51 @@ async def validate_invoice(invoice: InvoiceData):
     return results
 
 
+async def validate_all(invoices: list, concurrency: int = 8) -> list:
+    """
+    Validate many invoices concurrently
+    
+    At most `concurrency` invoices are in flight at once so LLM/embedding
+    backends are not flooded.
+    
+    Returns:
+        List of (invoice_json, invoice, results) tuples, or the exception
+        raised for that invoice, in input order
+    """
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def validate_one(invoice_json: dict):
+        async with semaphore:
+            invoice = convert_to_model(invoice_json)
+            return invoice_json, invoice, await validate_invoice(invoice)
+    
+    return await asyncio.gather(
+        *(validate_one(invoice_json) for invoice_json in invoices),
+        return_exceptions=True
+    )
+
+
 def display_results(invoice: InvoiceData, invoice_json: dict, results: dict):
     """Display validation results"""
     
-    print()
-    print("=" * 80)
-    print("COMPREHENSIVE COMPLIANCE VALIDATION RESULTS")
-    print("=" * 80)
-    print()
-    print(f"Invoice Number: {invoice.invoice_number}")
-    print(f"Date: {invoice.invoice_date}")
-    print(f"Amount: ₹{invoice.total_amount:,.2f}")
-    print(f"Vendor: {invoice.seller_name}")
-    print()
-    print(f"Test Category: {invoice_json.get('_test_category', 'N/A')}")
-    print(f"Complexity: {invoice_json.get('_complexity', 'N/A')}")
-    print(f"Expected Result: {invoice_json.get('_expected_result', 'N/A')}")
-    print()
+    # Collect lines and write once instead of one print() per line
+    out = []
+    
+    out.append("")
+    out.append("=" * 80)
+    out.append("COMPREHENSIVE COMPLIANCE VALIDATION RESULTS")
+    out.append("=" * 80)
+    out.append("")
+    out.append(f"Invoice Number: {invoice.invoice_number}")
+    out.append(f"Date: {invoice.invoice_date}")
+    out.append(f"Amount: ₹{invoice.total_amount:,.2f}")
+    out.append(f"Vendor: {invoice.seller_name}")
+    out.append("")
+    out.append(f"Test Category: {invoice_json.get('_test_category', 'N/A')}")
+    out.append(f"Complexity: {invoice_json.get('_complexity', 'N/A')}")
+    out.append(f"Expected Result: {invoice_json.get('_expected_result', 'N/A')}")
+    out.append("")
     
     # Display each category
     total_passed = 0
@@ -151,34 +256,22 @@ def display_results(invoice: InvoiceData, invoice_json: dict, results: dict):
     all_checks = []
     
     for category_name, result in results.items():
-        print("-" * 80)
-        print(f"Category: {result.category_name}")
-        print("-" * 80)
-        print()
+        out.append("-" * 80)
+        out.append(f"Category: {result.category_name}")
+        out.append("-" * 80)
+        out.append("")
         
         for check in result.checks:
-            status_symbol = {
-                'PASS': '✓',
-                'FAIL': '✗',
-                'WARNING': '⚠',
-                'SKIPPED': '○'
-            }.get(check.status.value, '?')
-            
-            status_color = {
-                'PASS': "\033[92m",    # Green
-                'FAIL': "\033[91m",    # Red
-                'WARNING': "\033[93m", # Yellow
-                'SKIPPED': "\033[90m"  # Gray
-            }.get(check.status.value, "")
-            reset_color = "\033[0m"
+            status_symbol = _STATUS_SYMBOL.get(check.status.value, '?')
+            status_color = _STATUS_COLOR.get(check.status.value, "")
             
-            print(f"{status_color}{status_symbol}{reset_color} {check.check_id}: {check.check_name}")
-            print(f"  Status: {check.status.value}")
-            print(f"  Confidence: {check.confidence:.0%}")
+            out.append(f"{status_color}{status_symbol}{_RESET_COLOR} {check.check_id}: {check.check_name}")
+            out.append(f"  Status: {check.status.value}")
+            out.append(f"  Confidence: {check.confidence:.0%}")
             if check.requires_review:
-                print(f"  ⚠️  REQUIRES HUMAN REVIEW")
-            print(f"  {check.reasoning[:100]}{'...' if len(check.reasoning) > 100 else ''}")
-            print()
+                out.append(f"  ⚠️  REQUIRES HUMAN REVIEW")
+            out.append(f"  {check.reasoning[:100]}{'...' if len(check.reasoning) > 100 else ''}")
+            out.append("")
             
             all_checks.append(check)
         
@@ -186,53 +279,90 @@ def display_results(invoice: InvoiceData, invoice_json: dict, results: dict):
         total_failed += result.failed_count
         total_warnings += result.warning_count
         
-        print(f"Category Summary: {result.passed_count} passed, {result.failed_count} failed, {result.warning_count} warnings")
-        print()
+        out.append(f"Category Summary: {result.passed_count} passed, {result.failed_count} failed, {result.warning_count} warnings")
+        out.append("")
     
     # Overall summary
-    print("-" * 80)
-    print("OVERALL SUMMARY")
-    print("-" * 80)
-    print(f"Total Checks: {len(all_checks)}")
-    print(f"Passed: {total_passed}")
-    print(f"Failed: {total_failed}")
-    print(f"Warnings: {total_warnings}")
+    out.append("-" * 80)
+    out.append("OVERALL SUMMARY")
+    out.append("-" * 80)
+    out.append(f"Total Checks: {len(all_checks)}")
+    out.append(f"Passed: {total_passed}")
+    out.append(f"Failed: {total_failed}")
+    out.append(f"Warnings: {total_warnings}")
     
     # Calculate average confidence
     avg_confidence = sum(c.confidence for c in all_checks) / len(all_checks) if all_checks else 0
-    print(f"Average Confidence: {avg_confidence:.0%}")
+    out.append(f"Average Confidence: {avg_confidence:.0%}")
     
     # Determine overall status
     if total_failed == 0:
-        print("\n✅ VALIDATION PASSED - All critical checks successful!")
+        out.append("\n✅ VALIDATION PASSED - All critical checks successful!")
         if total_warnings > 0:
-            print(f"   Note: {total_warnings} warning(s) for review")
+            out.append(f"   Note: {total_warnings} warning(s) for review")
     else:
-        print(f"\n⚠️  VALIDATION ISSUES - {total_failed} check(s) failed")
+        out.append(f"\n⚠️  VALIDATION ISSUES - {total_failed} check(s) failed")
         
         # List critical failures
         critical_failures = [c for c in all_checks if c.status.value == 'FAIL' and c.severity.value in ['HIGH', 'CRITICAL']]
         if critical_failures:
-            print(f"   Critical failures: {len(critical_failures)}")
+            out.append(f"   Critical failures: {len(critical_failures)}")
     
     # Check for required reviews
     reviews_needed = [c for c in all_checks if c.requires_review]
     if reviews_needed:
-        print(f"\n🔍 HUMAN REVIEW REQUIRED: {len(reviews_needed)} check(s) flagged")
+        out.append(f"\n🔍 HUMAN REVIEW REQUIRED: {len(reviews_needed)} check(s) flagged")
+    
+    out.append("=" * 80)
     
-    print("=" * 80)
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+async def main_all(concurrency: int):
+    """Validate every test invoice concurrently"""
+    
+    if not DATA_FILE.exists():
+        print(f"❌ Error: {DATA_FILE} not found!")
+        print("Make sure you're running this from the project root directory.")
+        return
+    
+    invoices = list(_load_all_invoices(DATA_FILE.stat().st_mtime_ns).values())
+    
+    print(f"🔍 Validating {len(invoices)} invoices (concurrency={concurrency})...")
+    outcomes = await validate_all(invoices, concurrency)
+    print("✓ Validation complete")
+    
+    for invoice_json, outcome in zip(invoices, outcomes):
+        if isinstance(outcome, Exception):
+            print()
+            print(f"❌ {invoice_json['invoice_id']}: {outcome}")
+            continue
+        
+        _, invoice, results = outcome
+        display_results(invoice, invoice_json, results)
 
 
 async def main():
     """Main execution"""
     
-    # Get invoice ID from command line or use default
-    invoice_id = sys.argv[1] if len(sys.argv) > 1 else "INV-2024-0001"
+    parser = argparse.ArgumentParser(description="Validate test invoices with all validators")
+    parser.add_argument("invoice_id", nargs="?", default="INV-2024-0001",
+                        help="Invoice ID to validate (default: INV-2024-0001)")
+    parser.add_argument("--all", action="store_true",
+                        help="Validate every invoice in data/test_invoices.json")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Maximum invoices validated at once with --all (default: 8)")
+    args = parser.parse_args()
+    invoice_id = args.invoice_id
     
     print()
     print("🚀 Compliance Validator - Comprehensive Test")
     print()
     
+    if args.all:
+        await main_all(args.concurrency)
+        return
+    
     # Load test invoice
     print(f"📄 Loading invoice: {invoice_id}")
     invoice_json = load_test_invoice(invoice_id)
@@ -276,6 +406,7 @@ async def main():
     print("💡 Try Other Invoices:")
     print("   python test_all_validators.py INV-2024-0002  # Transport with RCM")
     print("   python test_all_validators.py INV-2024-0847  # The famous edge case!")
+    print("   python test_all_validators.py --all           # Every test invoice")
     print()
 
 
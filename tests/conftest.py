@@ -0,0 +1,72 @@
+"""
+Shared pytest fixtures
+"""
+
+import asyncio
+import os
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # optional: stdlib asyncio event loop is used when uvloop is unavailable
+    uvloop = None
+
+from utils.validators import InvoiceValidator
+from utils.data_loaders import HistoricalDecisions, InvoiceDataLoader
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed"""
+    return uvloop.EventLoopPolicy() if uvloop is not None else asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def validator():
+    """Stateless InvoiceValidator shared by the whole test session"""
+    return InvoiceValidator()
+
+
+@pytest.fixture(scope="session")
+def historical_decisions():
+    """Historical decisions loaded once per test session"""
+    return HistoricalDecisions()
+
+
+@pytest.fixture(scope="session")
+def test_loader():
+    """Test invoice dataset, read from disk once per session"""
+    return InvoiceDataLoader()
+
+
+@pytest.fixture(scope="session")
+def orchestrator():
+    """
+    OrchestratorAgent shared across integration tests
+    
+    Safe to share: per-invoice state is created inside process_invoice,
+    the agent itself only holds configuration and validator instances.
+    """
+    from agents.orchestrator import OrchestratorAgent
+
+    config = {
+        'confidence_threshold': 0.70,
+        'high_value_threshold': 1000000
+    }
+    return OrchestratorAgent(config)
+
+
+@pytest.fixture(scope="session")
+def compliance_workflow():
+    """ComplianceWorkflow (LLM clients + compiled graph) built once per test session"""
+    if not os.getenv('OPENAI_API_KEY'):
+        pytest.skip("OPENAI_API_KEY not set - skipping test")
+
+    try:
+        from agents.langgraph_workflow import ComplianceWorkflow
+        return ComplianceWorkflow()
+    except Exception as e:
+        if "proxies" in str(e) or "ValidationError" in str(type(e).__name__):
+            pytest.skip(f"OpenAI library compatibility issue: {e}")
+        raise
@@ -0,0 +1,16 @@
+"""
+Shared assertion helpers for the test suite
+"""
+
+from typing import Iterable
+
+
+def errors_contain(errors: Iterable[str], *needles: str) -> bool:
+    """
+    True if any needle appears (case-insensitively) in any error message
+    
+    The errors are lowercased once as a single newline-joined string, so
+    each needle is one substring scan instead of one per error.
+    """
+    haystack = "\n".join(errors).lower()
+    return any(needle.lower() in haystack for needle in needles)
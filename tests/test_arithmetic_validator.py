@@ -81,6 +81,22 @@ class TestArithmeticValidator:
         # Check that C10 (total) failed
         c10_check = next(c for c in result.checks if c.check_id == 'C10')
         assert c10_check.status.value == 'FAIL'
+    
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_validation(self, validator, valid_invoice):
+        """Test that batch validation gives the same per-invoice results"""
+        
+        broken = valid_invoice.model_copy(update={'subtotal': 90000})
+        invoices = [valid_invoice, broken, valid_invoice]
+        
+        batch = await validator.validate_batch(invoices)
+        
+        assert len(batch) == len(invoices)
+        for invoice, result in zip(invoices, batch):
+            single = await validator.validate(invoice)
+            assert [(c.check_id, c.status, c.reasoning) for c in result.checks] == \
+                   [(c.check_id, c.status, c.reasoning) for c in single.checks]
+        assert batch[1].failed_count > 0
 
 
 if __name__ == "__main__":
@@ -4,21 +4,34 @@ Tests validation layer with various types of malformed/corrupted data
 """
 
 import pytest
+from types import MappingProxyType
 from utils.validators import InvoiceValidator, validate_invoice
+from tests.helpers import errors_contain
+
+
+# Read-only valid invoice; tests derive variants with {**_BASE_INVOICE, "field": value}
+_BASE_INVOICE = MappingProxyType({
+    "invoice_number": "INV-001",
+    "invoice_date": "2024-09-15",
+    "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
+    "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+    "line_items": [
+        {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
+    ],
+    "subtotal": 100,
+    "total_tax": 18,
+    "total_amount": 118
+})
 
 
 class TestMalformedDataHandling:
     """Tests that system handles malformed data gracefully"""
     
-    def setup_method(self):
-        """Setup validator for each test"""
-        self.validator = InvoiceValidator()
-    
-    def test_completely_empty_invoice(self):
+    def test_completely_empty_invoice(self, validator):
         """Test empty dictionary"""
         invoice = {}
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
         assert len(result.errors) > 0
@@ -26,7 +39,7 @@ class TestMalformedDataHandling:
         assert any("invoice_number" in err for err in result.errors)
         assert any("invoice_date" in err for err in result.errors)
     
-    def test_null_values(self):
+    def test_null_values(self, validator):
         """Test None/null values"""
         invoice = {
             "invoice_number": None,
@@ -39,12 +52,12 @@ class TestMalformedDataHandling:
             "total_amount": None
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
         assert len(result.errors) >= 3  # Multiple structure errors
     
-    def test_wrong_data_types(self):
+    def test_wrong_data_types(self, validator):
         """Test completely wrong data types"""
         invoice = {
             "invoice_number": 12345,  # Should be string
@@ -57,19 +70,16 @@ class TestMalformedDataHandling:
             "total_amount": {"amount": 118}  # Should be number
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
         # Should catch multiple type errors
         assert any("must be" in err for err in result.errors)
     
-    def test_negative_amounts(self):
+    def test_negative_amounts(self, validator):
         """Test negative amounts"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+            **_BASE_INVOICE,
             "line_items": [
                 {"description": "Item", "quantity": -5, "rate": -100, "amount": -500}
             ],
@@ -78,19 +88,15 @@ class TestMalformedDataHandling:
             "total_amount": -590
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("negative" in err.lower() or "positive" in err.lower() 
-                   for err in result.errors)
+        assert errors_contain(result.errors, "negative", "positive")
     
-    def test_zero_amounts(self):
+    def test_zero_amounts(self, validator):
         """Test zero amounts"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+            **_BASE_INVOICE,
             "line_items": [
                 {"description": "Item", "quantity": 0, "rate": 0, "amount": 0}
             ],
@@ -99,18 +105,15 @@ class TestMalformedDataHandling:
             "total_amount": 0
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("positive" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "positive")
     
-    def test_extreme_amounts(self):
+    def test_extreme_amounts(self, validator):
         """Test unreasonably large amounts"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+            **_BASE_INVOICE,
             "line_items": [
                 {"description": "Item", "quantity": 1, "rate": 999999999999, "amount": 999999999999}
             ],
@@ -119,129 +122,70 @@ class TestMalformedDataHandling:
             "total_amount": 999999999999
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("unreasonably" in err.lower() or "high" in err.lower() 
-                   for err in result.errors)
+        assert errors_contain(result.errors, "unreasonably", "high")
     
-    def test_future_date(self):
+    def test_future_date(self, validator):
         """Test invoice dated in future"""
-        invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2099-12-31",  # Future!
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [
-                {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-            ],
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 118
-        }
+        invoice = {**_BASE_INVOICE, "invoice_date": "2099-12-31"}  # Future!
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("future" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "future")
     
-    def test_very_old_date(self):
+    def test_very_old_date(self, validator):
         """Test invoice dated too far in past"""
-        invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "1990-01-01",  # Too old!
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [
-                {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-            ],
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 118
-        }
+        invoice = {**_BASE_INVOICE, "invoice_date": "1990-01-01"}  # Too old!
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("too old" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "too old")
     
-    def test_invalid_date_format(self):
+    def test_invalid_date_format(self, validator):
         """Test invalid date format"""
-        invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "32/13/2024",  # Invalid format
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [
-                {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-            ],
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 118
-        }
+        invoice = {**_BASE_INVOICE, "invoice_date": "32/13/2024"}  # Invalid format
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("date" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "date")
     
-    def test_invalid_gstin_formats(self):
+    @pytest.mark.parametrize("bad_gstin", [
+        "123",  # Too short
+        "ABCD1234EFGH56789Z1",  # Wrong format
+        "27AABCT1234F1Z",  # Missing character
+        "99INVALID99999X9X9",  # Invalid format
+        "",  # Empty
+        "NOT-A-GSTIN",  # Completely wrong
+    ])
+    def test_invalid_gstin_formats(self, validator, bad_gstin):
         """Test various invalid GSTIN formats"""
         
-        invalid_gstins = [
-            "123",  # Too short
-            "ABCD1234EFGH56789Z1",  # Wrong format
-            "27AABCT1234F1Z",  # Missing character
-            "99INVALID99999X9X9",  # Invalid format
-            "",  # Empty
-            "NOT-A-GSTIN",  # Completely wrong
-        ]
-        
-        for bad_gstin in invalid_gstins:
-            invoice = {
-                "invoice_number": "INV-001",
-                "invoice_date": "2024-09-15",
-                "vendor": {"name": "Test", "gstin": bad_gstin},
-                "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-                "line_items": [
-                    {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-                ],
-                "subtotal": 100,
-                "total_tax": 18,
-                "total_amount": 118
-            }
-            
-            result = self.validator.validate(invoice)
-            
-            assert result.is_valid == False, f"Should fail for GSTIN: {bad_gstin}"
-            assert any("GSTIN" in err for err in result.errors), \
-                   f"Should have GSTIN error for: {bad_gstin}"
+        invoice = {**_BASE_INVOICE, "vendor": {"name": "Test", "gstin": bad_gstin}}
+        
+        result = validator.validate(invoice)
+        
+        assert result.is_valid == False, f"Should fail for GSTIN: {bad_gstin}"
+        assert any("GSTIN" in err for err in result.errors), \
+               f"Should have GSTIN error for: {bad_gstin}"
     
-    def test_empty_line_items_list(self):
+    def test_empty_line_items_list(self, validator):
         """Test invoice with empty line items"""
-        invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [],  # Empty!
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 118
-        }
+        invoice = {**_BASE_INVOICE, "line_items": []}  # Empty!
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("line item" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "line item")
     
-    def test_line_item_calculation_errors(self):
+    def test_line_item_calculation_errors(self, validator):
         """Test line items with wrong calculations"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+            **_BASE_INVOICE,
             "line_items": [
                 {
                     "description": "Item",
@@ -255,95 +199,70 @@ class TestMalformedDataHandling:
             "total_amount": 999
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("calculation" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "calculation")
     
-    def test_amount_mismatch_subtotal_tax_total(self):
+    def test_amount_mismatch_subtotal_tax_total(self, validator):
         """Test when subtotal + tax ≠ total"""
-        invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [
-                {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-            ],
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 999  # Should be 118!
-        }
+        invoice = {**_BASE_INVOICE, "total_amount": 999}  # Should be 118!
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("mismatch" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "mismatch")
     
-    def test_tax_components_mismatch(self):
+    def test_tax_components_mismatch(self, validator):
         """Test when CGST + SGST + IGST ≠ total tax"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
-            "line_items": [
-                {"description": "Item", "quantity": 1, "rate": 100, "amount": 100}
-            ],
-            "subtotal": 100,
+            **_BASE_INVOICE,
             "cgst_amount": 5,
             "sgst_amount": 5,
             "igst_amount": 0,
-            "total_tax": 18,  # Should be 10!
-            "total_amount": 118
+            "total_tax": 18  # Should be 10!
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
         assert any("tax" in err.lower() and "mismatch" in err.lower() 
                    for err in result.errors)
     
-    def test_missing_line_item_fields(self):
+    def test_missing_line_item_fields(self, validator):
         """Test line items missing required fields"""
         invoice = {
-            "invoice_number": "INV-001",
-            "invoice_date": "2024-09-15",
-            "vendor": {"name": "Test", "gstin": "27AABCT1234F1ZP"},
-            "buyer": {"name": "Test", "gstin": "27AABCF9999K1ZX"},
+            **_BASE_INVOICE,
             "line_items": [
                 {
                     "description": "Item",
                     # Missing quantity, rate, amount!
                 }
-            ],
-            "subtotal": 100,
-            "total_tax": 18,
-            "total_amount": 118
+            ]
         }
         
-        result = self.validator.validate(invoice)
+        result = validator.validate(invoice)
         
         assert result.is_valid == False
-        assert any("missing field" in err.lower() for err in result.errors)
+        assert errors_contain(result.errors, "missing field")
     
-    def test_safe_validation_with_none(self):
+    def test_safe_validation_with_none(self, validator):
         """Test that safe validation handles None gracefully"""
-        is_valid, errors = self.validator.validate_safe(None)
+        is_valid, errors = validator.validate_safe(None)
         
         assert is_valid == False
         assert len(errors) > 0
     
-    def test_safe_validation_with_string(self):
+    def test_safe_validation_with_string(self, validator):
         """Test that safe validation handles string gracefully"""
-        is_valid, errors = self.validator.validate_safe("not a dict")
+        is_valid, errors = validator.validate_safe("not a dict")
         
         assert is_valid == False
         assert len(errors) > 0
     
-    def test_safe_validation_with_list(self):
+    def test_safe_validation_with_list(self, validator):
         """Test that safe validation handles list gracefully"""
-        is_valid, errors = self.validator.validate_safe([1, 2, 3])
+        is_valid, errors = validator.validate_safe([1, 2, 3])
         
         assert is_valid == False
         assert len(errors) > 0
@@ -352,7 +271,7 @@ class TestMalformedDataHandling:
 class TestEdgeCaseValidation:
     """Test edge cases and boundary conditions"""
     
-    def test_minimum_valid_invoice(self):
+    def test_minimum_valid_invoice(self, validator):
         """Test invoice with absolute minimum valid data"""
         invoice = {
             "invoice_number": "I",
@@ -367,13 +286,12 @@ class TestEdgeCaseValidation:
             "total_amount": 1
         }
         
-        validator = InvoiceValidator()
         result = validator.validate(invoice)
         
         # Should be valid (minimal but complete)
         assert result.is_valid == True
     
-    def test_unicode_in_descriptions(self):
+    def test_unicode_in_descriptions(self, validator):
         """Test Unicode characters in text fields"""
         invoice = {
             "invoice_number": "INV-001",
@@ -391,13 +309,12 @@ class TestEdgeCaseValidation:
             "igst_amount": 0
         }
         
-        validator = InvoiceValidator()
         result = validator.validate(invoice)
         
         # Should be valid (Unicode is fine in text fields)
         assert result.is_valid == True
     
-    def test_floating_point_precision(self):
+    def test_floating_point_precision(self, validator):
         """Test floating point calculation precision"""
         invoice = {
             "invoice_number": "INV-001",
@@ -415,7 +332,6 @@ class TestEdgeCaseValidation:
             "igst_amount": 0
         }
         
-        validator = InvoiceValidator()
         result = validator.validate(invoice)
         
         # Should be valid (within rounding tolerance)
@@ -2,37 +2,65 @@
 Configuration management
 """
 
+import copy
+import functools
 import yaml
 import os
 from pathlib import Path
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # optional: pure-Python loader is used when PyYAML lacks libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+
+@functools.cache
+def _ensure_env() -> bool:
+    """Load .env into the environment on first use, once per process"""
+    
+    load_dotenv()
+    return True
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(config_file: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file once per (path, modification time)"""
+    
+    with open(config_file, 'rb') as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """Load configuration from YAML file"""
     
+    _ensure_env()
+    
     config_file = Path(config_path)
     
     if not config_file.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
-    with open(config_file) as f:
-        config = yaml.safe_load(f)
+    config_file = config_file.resolve()
+    
+    # Callers get their own copy so mutations never leak into the cache
+    config = copy.deepcopy(_parse_config(str(config_file), config_file.stat().st_mtime_ns))
+    
+    environ = os.environ
+    orchestrator_model = environ.get('ORCHESTRATOR_MODEL')
+    validator_model = environ.get('VALIDATOR_MODEL')
     
     # Override with environment variables if present
-    if os.getenv('ORCHESTRATOR_MODEL'):
-        config['models']['orchestrator'] = os.getenv('ORCHESTRATOR_MODEL')
-    if os.getenv('VALIDATOR_MODEL'):
-        config['models']['validator'] = os.getenv('VALIDATOR_MODEL')
+    if orchestrator_model:
+        config['models']['orchestrator'] = orchestrator_model
+    if validator_model:
+        config['models']['validator'] = validator_model
     
     # Add API keys
     config['api_keys'] = {
-        'openai': os.getenv('OPENAI_API_KEY'),
-        'anthropic': os.getenv('ANTHROPIC_API_KEY')
+        'openai': environ.get('OPENAI_API_KEY'),
+        'anthropic': environ.get('ANTHROPIC_API_KEY')
     }
     
     return config
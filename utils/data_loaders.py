@@ -2,12 +2,44 @@
 Data loaders for all challenge data files
 """
 
+import bisect
+import functools
 import json
-import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 from datetime import date, datetime
-import yaml
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is unavailable
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_reference_file(path: str, mtime_ns: int):
+    """Parse a reference data file once per (path, modification time)"""
+    
+    with open(path, 'rb') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml  # deferred: only the policy file needs it
+            
+            # libyaml's C loader when PyYAML was built with it
+            return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        return _json_loads(f.read())
+
+
+def _load_reference_file(path: Path):
+    """
+    Load a read-only reference data file (vendors, codes, sections, policy)
+    
+    The parsed result is shared by every loader instance, so it must not be mutated.
+    """
+    return _parse_reference_file(str(path), path.stat().st_mtime_ns)
 
 
 class InvoiceDataLoader:
@@ -16,34 +48,37 @@ class InvoiceDataLoader:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.invoices = self._load_invoices()
+        
+        # Single-pass indexes for the id/category/complexity accessors
+        self._by_id: Dict[str, Dict] = {}
+        self._by_category: Dict[str, List[Dict]] = {}
+        self._by_complexity: Dict[str, List[Dict]] = {}
+        for inv in self.invoices:
+            self._by_id.setdefault(inv['invoice_id'], inv)
+            self._by_category.setdefault(inv.get('_test_category'), []).append(inv)
+            self._by_complexity.setdefault(inv.get('_complexity'), []).append(inv)
     
     def _load_invoices(self) -> List[Dict]:
         """Load all test invoices"""
         invoice_file = self.data_dir / "test_invoices.json"
         
-        with open(invoice_file) as f:
-            return json.load(f)
+        with open(invoice_file, 'rb') as f:
+            return _json_loads(f.read())
     
     def get_invoice(self, invoice_id: str) -> Dict:
         """Get specific invoice by ID"""
-        for inv in self.invoices:
-            if inv['invoice_id'] == invoice_id:
-                return inv
-        raise ValueError(f"Invoice {invoice_id} not found")
+        invoice = self._by_id.get(invoice_id)
+        if invoice is None:
+            raise ValueError(f"Invoice {invoice_id} not found")
+        return invoice
     
     def get_by_category(self, category: str) -> List[Dict]:
         """Get invoices by test category"""
-        return [
-            inv for inv in self.invoices 
-            if inv.get('_test_category') == category
-        ]
+        return list(self._by_category.get(category, ()))
     
     def get_by_complexity(self, complexity: str) -> List[Dict]:
         """Get invoices by complexity level"""
-        return [
-            inv for inv in self.invoices 
-            if inv.get('_complexity') == complexity
-        ]
+        return list(self._by_complexity.get(complexity, ()))
 
 
 class VendorRegistry:
@@ -54,14 +89,13 @@ class VendorRegistry:
         self.vendors = self._load_vendors()
         self.gstin_index = self._build_gstin_index()
         self.pan_index = self._build_pan_index()
+        self.related_gstins = self._build_related_gstins()
     
     def _load_vendors(self) -> List[Dict]:
         """Load vendor registry"""
         vendor_file = self.data_dir / "vendor_registry.json"
         
-        with open(vendor_file) as f:
-            data = json.load(f)
-            return data['vendors']
+        return _load_reference_file(vendor_file)['vendors']
     
     def _build_gstin_index(self) -> Dict:
         """Build GSTIN lookup index"""
@@ -78,6 +112,13 @@ class VendorRegistry:
                 pan_index[pan].append(v)
         return pan_index
     
+    def _build_related_gstins(self) -> set:
+        """Build set of GSTINs whose PAN is shared with another vendor"""
+        return {
+            gstin for gstin, vendor in self.gstin_index.items()
+            if vendor.get('pan') and len(self.pan_index[vendor['pan']]) > 1
+        }
+    
     def get_by_gstin(self, gstin: str) -> Dict:
         """Get vendor by GSTIN"""
         vendor = self.gstin_index.get(gstin)
@@ -87,14 +128,7 @@ class VendorRegistry:
     
     def is_related_party(self, gstin: str) -> bool:
         """Check if vendor is related party"""
-        try:
-            vendor = self.get_by_gstin(gstin)
-            pan = vendor.get('pan')
-            if pan:
-                return len(self.pan_index.get(pan, [])) > 1
-        except ValueError:
-            pass
-        return False
+        return gstin in self.related_gstins
 
 
 class GSTRateSchedule:
@@ -103,48 +137,60 @@ class GSTRateSchedule:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.rates_df = self._load_rates()
+        self.hsn_index = self._build_hsn_index()
     
-    def _load_rates(self) -> pd.DataFrame:
+    def _load_rates(self) -> "pd.DataFrame":
         """Load GST rates schedule"""
-        rates_file = self.data_dir / "gst_rates_schedule.csv"
+        import pandas as pd  # deferred: only the rate schedule needs pandas
         
-        df = pd.read_csv(rates_file)
-        df['effective_from'] = pd.to_datetime(df['effective_from'])
-        df['effective_to'] = pd.to_datetime(df['effective_to'])
+        rates_file = self.data_dir / "gst_rates_schedule.csv"
         
-        return df
+        # Dates are parsed by the CSV reader itself rather than in a second pass
+        return pd.read_csv(rates_file, parse_dates=['effective_from', 'effective_to'])
+    
+    def _build_hsn_index(self) -> Dict:
+        """Build HSN/SAC lookup index (rows kept in schedule order)"""
+        hsn_index = {}
+        columns = ['hsn_sac_code', 'effective_from', 'effective_to', 'description',
+                   'rate_cgst', 'rate_sgst', 'rate_igst']
+        for code, *row in self.rates_df[columns].itertuples(index=False, name=None):
+            hsn_index.setdefault(code, []).append(tuple(row))
+        return hsn_index
     
     def get_rate(self, hsn_sac: str, invoice_date: date) -> Dict:
         """Get applicable GST rate for date"""
         
-        matches = self.rates_df[self.rates_df['hsn_sac_code'] == hsn_sac]
+        matches = self.hsn_index.get(hsn_sac)
         
-        if matches.empty:
+        if not matches:
             raise ValueError(f"HSN/SAC {hsn_sac} not found")
         
+        import pandas as pd  # already loaded by _load_rates
+        
         invoice_dt = pd.Timestamp(invoice_date)
         
-        applicable = matches[
-            (matches['effective_from'] <= invoice_dt) &
-            ((matches['effective_to'].isna()) | (matches['effective_to'] >= invoice_dt))
-        ]
+        rate_row = next(
+            (row for row in matches
+             if row[0] <= invoice_dt and (pd.isna(row[1]) or row[1] >= invoice_dt)),
+            None
+        )
         
-        if applicable.empty:
-            historical = matches[matches['effective_from'] <= invoice_dt]
-            if not historical.empty:
-                applicable = historical.sort_values('effective_from', ascending=False).head(1)
-            else:
+        if rate_row is None:
+            # Fall back to the most recent rate that had started by the invoice date
+            historical = [row for row in matches if row[0] <= invoice_dt]
+            if not historical:
                 raise ValueError(f"No rate found for {hsn_sac} on {invoice_date}")
+            rate_row = max(historical, key=lambda row: row[0])
         
-        rate_row = applicable.iloc[0]
+        effective_from, _, description, cgst, sgst, igst = rate_row
         
         return {
             'hsn_sac': hsn_sac,
-            'description': rate_row['description'],
-            'cgst': rate_row['rate_cgst'],
-            'sgst': rate_row['rate_sgst'],
-            'igst': rate_row['rate_igst'],
-            'effective_from': rate_row['effective_from'].date()
+            'description': description,
+            'cgst': cgst,
+            'sgst': sgst,
+            'igst': igst,
+            'effective_from': effective_from.date()
         }
 
 
@@ -159,8 +205,7 @@ class HSNSACMaster:
         """Load HSN/SAC codes"""
         codes_file = self.data_dir / "hsn_sac_codes.json"
         
-        with open(codes_file) as f:
-            return json.load(f)
+        return _load_reference_file(codes_file)
     
     def get_code(self, code: str) -> Dict:
         """Get HSN/SAC code details"""
@@ -186,9 +231,8 @@ class TDSSectionRules:
         """Load TDS sections"""
         sections_file = self.data_dir / "tds_sections.json"
         
-        with open(sections_file) as f:
-            data = json.load(f)
-            return {s['section']: s for s in data['tds_sections']}
+        data = _load_reference_file(sections_file)
+        return {s['section']: s for s in data['tds_sections']}
     
     def get_section(self, section: str) -> Optional[Dict]:
         """Get section details"""
@@ -220,52 +264,56 @@ class CompanyPolicy:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.policy = self._load_policy()
+        self.approval_cutoffs, self.approvals, self.approvals_by_level = self._build_approval_index()
     
     def _load_policy(self) -> Dict:
         """Load company policy"""
         policy_file = self.data_dir / "company_policy.yaml"
         
-        with open(policy_file) as f:
-            return yaml.safe_load(f)
+        return _load_reference_file(policy_file)
     
-    def get_approval_level(self, amount: float, vendor_gstin: str = None, 
-                          is_first_time: bool = False, is_retrospective: bool = False) -> Dict:
-        """Determine required approval level based on amount and risk factors"""
+    def _build_approval_index(self) -> tuple:
+        """
+        Build approval lookup tables from the approval matrix
         
-        levels = self.policy['approval_matrix']['levels']
+        Cutoffs are the running maximum of each level's max_amount (None = no
+        limit), so bisecting them finds the first level, in matrix order, that
+        covers an amount.
+        """
+        cutoffs = []
+        approvals = []
+        by_level = {}
+        highest = float('-inf')
         
-        # Base approval level by amount
-        base_level = None
-        for level in levels:
+        for level in self.policy['approval_matrix']['levels']:
             max_amount = level.get('max_amount')
-            if max_amount is None or amount <= max_amount:
-                base_level = level
-                break
+            highest = max(highest, float('inf') if max_amount is None else max_amount)
+            cutoffs.append(highest)
+            
+            approval = {
+                'level': level['level'],
+                'name': level['name'],
+                'approvers': level['approvers']
+            }
+            approvals.append(approval)
+            by_level.setdefault(level['level'], approval)
         
-        if not base_level:
-            base_level = levels[-1]
+        return cutoffs, approvals, by_level
+    
+    def get_approval_level(self, amount: float, vendor_gstin: str = None, 
+                          is_first_time: bool = False, is_retrospective: bool = False) -> Dict:
+        """Determine required approval level based on amount and risk factors"""
         
-        # Increase approval level for risk factors
-        approval_level = base_level['level']
+        # Base approval level by amount (amounts above every limit get the last level)
+        index = bisect.bisect_left(self.approval_cutoffs, amount)
+        base_level = self.approvals[min(index, len(self.approvals) - 1)]
         
         # First-time vendor or retrospective invoice requires +1 level
         if is_first_time or is_retrospective:
-            approval_level = min(approval_level + 1, len(levels))
-            
-            # Find the higher level
-            for level in levels:
-                if level['level'] == approval_level:
-                    return {
-                        'level': level['level'],
-                        'name': level['name'],
-                        'approvers': level['approvers']
-                    }
+            approval_level = min(base_level['level'] + 1, len(self.approvals))
+            return self.approvals_by_level.get(approval_level, base_level)
         
-        return {
-            'level': base_level['level'],
-            'name': base_level['name'],
-            'approvers': base_level['approvers']
-        }
+        return base_level
 
 
 class HistoricalDecisions:
@@ -274,6 +322,7 @@ class HistoricalDecisions:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.decisions = self._load_decisions()
+        self.invoice_index = self._build_invoice_index()
 
     def _load_decisions(self) -> List[Dict]:
         """Load historical decision data"""
@@ -281,18 +330,22 @@ class HistoricalDecisions:
 
         decisions = []
         try:
-            with open(decisions_file) as f:
+            with open(decisions_file, 'rb') as f:
                 for line in f:
                     if line.strip():
-                        decisions.append(json.loads(line))
+                        decisions.append(_json_loads(line))
         except FileNotFoundError:
             pass
 
         return decisions
 
+    def _build_invoice_index(self) -> Dict:
+        """Build invoice ID lookup index (first decision per invoice wins)"""
+        invoice_index = {}
+        for decision in self.decisions:
+            invoice_index.setdefault(decision.get('invoice_id'), decision)
+        return invoice_index
+
     def get_by_invoice(self, invoice_id: str) -> Optional[Dict]:
         """Get historical decision for specific invoice"""
-        for decision in self.decisions:
-            if decision.get('invoice_id') == invoice_id:
-                return decision
-        return None
+        return self.invoice_index.get(invoice_id)
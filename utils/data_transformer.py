@@ -3,14 +3,58 @@ Data transformer to flatten nested invoice structure from test data
 Converts vendor/buyer nested structure to flat seller/buyer fields
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 
-
-def transform_invoice_data(invoice_dict: Dict[str, Any]) -> Dict[str, Any]:
+# GST state codes (first two GSTIN digits) to state names; built once at import.
+# A plain dict (never mutated): lookups skip the MappingProxyType indirection.
+_STATE_NAMES = {
+    "01": "Jammu and Kashmir",
+    "02": "Himachal Pradesh",
+    "03": "Punjab",
+    "04": "Chandigarh",
+    "05": "Uttarakhand",
+    "06": "Haryana",
+    "07": "Delhi",
+    "08": "Rajasthan",
+    "09": "Uttar Pradesh",
+    "10": "Bihar",
+    "11": "Sikkim",
+    "12": "Arunachal Pradesh",
+    "13": "Nagaland",
+    "14": "Manipur",
+    "15": "Mizoram",
+    "16": "Tripura",
+    "17": "Meghalaya",
+    "18": "Assam",
+    "19": "West Bengal",
+    "20": "Jharkhand",
+    "21": "Odisha",
+    "22": "Chhattisgarh",
+    "23": "Madhya Pradesh",
+    "24": "Gujarat",
+    "26": "Dadra and Nagar Haveli and Daman and Diu",
+    "27": "Maharashtra",
+    "29": "Karnataka",
+    "30": "Goa",
+    "31": "Lakshadweep",
+    "32": "Kerala",
+    "33": "Tamil Nadu",
+    "34": "Puducherry",
+    "35": "Andaman and Nicobar Islands",
+    "36": "Telangana",
+    "37": "Andhra Pradesh",
+    "38": "Ladakh",
+}
+
+
+def transform_invoice_data(invoice_dict: Dict[str, Any], in_place: bool = False) -> Dict[str, Any]:
     """
     Transform nested invoice structure to flat structure expected by validators
 
+    Pass in_place=True to add the flat fields to invoice_dict itself when the
+    caller no longer needs the original; otherwise a shallow copy is returned.
+
     Input structure (from test_invoices.json):
         {
             "vendor": {"name": "...", "gstin": "...", "pan": "..."},
@@ -29,7 +73,9 @@ def transform_invoice_data(invoice_dict: Dict[str, Any]) -> Dict[str, Any]:
         }
     """
 
-    transformed = invoice_dict.copy()
+    # Decided up front: with in_place the defaults below land in invoice_dict too
+    missing_total_tax = invoice_dict.get("total_tax") is None
+    transformed = invoice_dict if in_place else invoice_dict.copy()
 
     # Transform vendor -> seller
     if "vendor" in invoice_dict:
@@ -82,7 +128,7 @@ def transform_invoice_data(invoice_dict: Dict[str, Any]) -> Dict[str, Any]:
     transformed.setdefault("total_tax", 0)
 
     # Calculate total_tax if not present
-    if "total_tax" not in invoice_dict or invoice_dict["total_tax"] is None:
+    if missing_total_tax:
         cgst = transformed.get("cgst_amount", 0) or 0
         sgst = transformed.get("sgst_amount", 0) or 0
         igst = transformed.get("igst_amount", 0) or 0
@@ -92,17 +138,20 @@ def transform_invoice_data(invoice_dict: Dict[str, Any]) -> Dict[str, Any]:
     if "line_items" in transformed:
         line_items = []
         for item in transformed["line_items"]:
+            # Items that already carry a tax_rate are passed through uncopied
+            if "tax_rate" in item:
+                line_items.append(item)
+                continue
+
             new_item = item.copy()
 
-            # Calculate tax_rate if not present
-            if "tax_rate" not in new_item:
-                # Determine tax rate from invoice level
-                if transformed.get("igst_rate", 0) > 0:
-                    new_item["tax_rate"] = transformed.get("igst_rate", 0)
-                else:
-                    cgst_rate = transformed.get("cgst_rate", 0) or 0
-                    sgst_rate = transformed.get("sgst_rate", 0) or 0
-                    new_item["tax_rate"] = cgst_rate + sgst_rate
+            # Determine tax rate from invoice level
+            if transformed.get("igst_rate", 0) > 0:
+                new_item["tax_rate"] = transformed.get("igst_rate", 0)
+            else:
+                cgst_rate = transformed.get("cgst_rate", 0) or 0
+                sgst_rate = transformed.get("sgst_rate", 0) or 0
+                new_item["tax_rate"] = cgst_rate + sgst_rate
 
             line_items.append(new_item)
 
@@ -111,46 +160,14 @@ def transform_invoice_data(invoice_dict: Dict[str, Any]) -> Dict[str, Any]:
     return transformed
 
 
+def transform_invoice_data_batch(invoices: List[Dict[str, Any]], in_place: bool = False) -> List[Dict[str, Any]]:
+    """Transform a list of invoices; see transform_invoice_data for the mapping"""
+
+    return [transform_invoice_data(invoice, in_place) for invoice in invoices]
+
+
 def _get_state_name(state_code: str) -> str:
     """Get state name from state code"""
 
-    state_mapping = {
-        "01": "Jammu and Kashmir",
-        "02": "Himachal Pradesh",
-        "03": "Punjab",
-        "04": "Chandigarh",
-        "05": "Uttarakhand",
-        "06": "Haryana",
-        "07": "Delhi",
-        "08": "Rajasthan",
-        "09": "Uttar Pradesh",
-        "10": "Bihar",
-        "11": "Sikkim",
-        "12": "Arunachal Pradesh",
-        "13": "Nagaland",
-        "14": "Manipur",
-        "15": "Mizoram",
-        "16": "Tripura",
-        "17": "Meghalaya",
-        "18": "Assam",
-        "19": "West Bengal",
-        "20": "Jharkhand",
-        "21": "Odisha",
-        "22": "Chhattisgarh",
-        "23": "Madhya Pradesh",
-        "24": "Gujarat",
-        "26": "Dadra and Nagar Haveli and Daman and Diu",
-        "27": "Maharashtra",
-        "29": "Karnataka",
-        "30": "Goa",
-        "31": "Lakshadweep",
-        "32": "Kerala",
-        "33": "Tamil Nadu",
-        "34": "Puducherry",
-        "35": "Andaman and Nicobar Islands",
-        "36": "Telangana",
-        "37": "Andhra Pradesh",
-        "38": "Ladakh",
-    }
-
-    return state_mapping.get(state_code, f"State-{state_code}")
\ No newline at end of file
+    name = _STATE_NAMES.get(state_code)
+    return name if name is not None else f"State-{state_code}"
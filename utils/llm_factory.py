@@ -7,6 +7,19 @@ import os
 from langchain_openai import ChatOpenAI
 
 
+# Dedicated provider keys in priority order: (env var, service, base URL, icon)
+_PROVIDERS = (
+    ("GROQ_API_KEY", "Groq", "https://api.groq.com/openai/v1", "⚡"),
+    ("XAI_API_KEY", "Grok", "https://api.x.ai/v1", "🤖"),
+)
+
+# Groq/xAI keys are also recognised by prefix when set as OPENAI_API_KEY
+_OPENAI_KEY_PREFIXES = (
+    ("gsk_", _PROVIDERS[0]),
+    ("xai-", _PROVIDERS[1]),
+)
+
+
 def get_llm(model: str = "llama-3.3-70b-versatile", temperature: float = 0) -> ChatOpenAI:
     """
     Get configured LLM instance
@@ -21,56 +34,26 @@ def get_llm(model: str = "llama-3.3-70b-versatile", temperature: float = 0) -> C
         Configured ChatOpenAI instance
     """
 
-    # Check which API to use
-    groq_key = os.getenv("GROQ_API_KEY")
-    xai_key = os.getenv("XAI_API_KEY")
-    openai_key = os.getenv("OPENAI_API_KEY")
-
     # Priority: Groq > xAI > OpenAI
-    if groq_key:
-        print(f"⚡ Using Groq API with model: {model}")
-        return ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            base_url="https://api.groq.com/openai/v1",
-            api_key=groq_key
-        )
-    elif xai_key:
-        print(f"🤖 Using Grok API with model: {model}")
-        return ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            base_url="https://api.x.ai/v1",
-            api_key=xai_key
-        )
-    elif openai_key:
-        # Auto-detect which service based on key prefix
-        if openai_key.startswith("gsk_"):
-            print(f"⚡ Using Groq API (via OPENAI_API_KEY) with model: {model}")
-            return ChatOpenAI(
-                model=model,
-                temperature=temperature,
-                base_url="https://api.groq.com/openai/v1",
-                api_key=openai_key
-            )
-        elif openai_key.startswith("xai-"):
-            print(f"🤖 Using Grok API (via OPENAI_API_KEY) with model: {model}")
-            return ChatOpenAI(
-                model=model,
-                temperature=temperature,
-                base_url="https://api.x.ai/v1",
-                api_key=openai_key
-            )
-        else:
-            print(f"🤖 Using OpenAI API with model: {model}")
-            return ChatOpenAI(
-                model=model,
-                temperature=temperature,
-                api_key=openai_key
-            )
-    else:
+    for env_var, service, base_url, icon in _PROVIDERS:
+        api_key = os.getenv(env_var)
+        if api_key:
+            print(f"{icon} Using {service} API with model: {model}")
+            return ChatOpenAI(model=model, temperature=temperature, base_url=base_url, api_key=api_key)
+
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
         raise ValueError("No API key found. Set GROQ_API_KEY, XAI_API_KEY, or OPENAI_API_KEY in .env")
 
+    # Auto-detect which service based on key prefix
+    for prefix, (_, service, base_url, icon) in _OPENAI_KEY_PREFIXES:
+        if openai_key.startswith(prefix):
+            print(f"{icon} Using {service} API (via OPENAI_API_KEY) with model: {model}")
+            return ChatOpenAI(model=model, temperature=temperature, base_url=base_url, api_key=openai_key)
+
+    print(f"🤖 Using OpenAI API with model: {model}")
+    return ChatOpenAI(model=model, temperature=temperature, api_key=openai_key)
+
 
 # Groq model names (RECOMMENDED - Fast & Free!)
 LLAMA_70B = "llama-3.3-70b-versatile"      # Latest Llama 3.3 (Best!)
@@ -3,23 +3,59 @@ Validation Layer for Invoice Data
 Comprehensive validation to catch malformed data before processing
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Mapping, Tuple, Optional, Type
 from datetime import date, datetime
 import re
+import numpy as np
 from pydantic import BaseModel, ValidationError
 
 
+# Compiled once at import; shared by every InvoiceValidator instance
+_GSTIN_RE = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}$')
+_GSTIN_LENGTH = 15
+
+
+def _is_valid_gstin(gstin: str) -> bool:
+    """Length check first; only 15-character strings reach the regex"""
+    return len(gstin) == _GSTIN_LENGTH and _GSTIN_RE.match(gstin) is not None
+
+
+# Top-level fields every invoice must carry (tuple keeps error order stable)
+_REQUIRED_FIELDS = (
+    'invoice_number',
+    'invoice_date',
+    'vendor',
+    'buyer',
+    'line_items',
+    'subtotal',
+    'total_tax',
+    'total_amount'
+)
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+
+# Money is compared in whole paise; one paisa of slack absorbs rounding chains
+_PAISE_TOLERANCE = 1
+
+# Below this many line items the plain per-item loop is faster than NumPy
+_VECTORISE_MIN_ITEMS = 16
+
+
+def _to_paise(value: float) -> int:
+    """Convert a rupee amount to integer paise"""
+    return round(value * 100)
+
+
 class ValidationResult:
     """Result of validation check"""
     
-    def __init__(self, is_valid: bool, errors: List[str] = None):
+    def __init__(self, is_valid: bool, errors: Optional[List[str]] = None) -> None:
         self.is_valid = is_valid
         self.errors = errors or []
     
-    def __bool__(self):
+    def __bool__(self) -> bool:
         return self.is_valid
     
-    def add_error(self, error: str):
+    def add_error(self, error: str) -> None:
         self.errors.append(error)
         self.is_valid = False
 
@@ -30,25 +66,16 @@ class InvoiceValidator:
     Prevents malformed data from reaching the validation pipeline
     """
     
-    def __init__(self):
-        self.gstin_pattern = re.compile(r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}$')
-        self.required_fields = [
-            'invoice_number',
-            'invoice_date',
-            'vendor',
-            'buyer',
-            'line_items',
-            'subtotal',
-            'total_tax',
-            'total_amount'
-        ]
+    def __init__(self) -> None:
+        self.gstin_pattern = _GSTIN_RE
+        self.required_fields = _REQUIRED_FIELDS
     
-    def validate(self, invoice_data: Dict) -> ValidationResult:
+    def validate(self, invoice_data: Mapping) -> ValidationResult:
         """
         Comprehensive validation of invoice data
         
         Args:
-            invoice_data: Invoice dictionary to validate
+            invoice_data: Invoice mapping (dict or read-only view) to validate
             
         Returns:
             ValidationResult with is_valid flag and error list
@@ -80,13 +107,17 @@ class InvoiceValidator:
         
         return result
     
-    def _validate_required_fields(self, data: Dict, result: ValidationResult):
+    def _validate_required_fields(self, data: Mapping, result: ValidationResult) -> None:
         """Check all required fields are present"""
-        for field in self.required_fields:
-            if field not in data:
+        missing = _REQUIRED_FIELD_SET.difference(data)
+        if not missing:
+            return
+        
+        for field in _REQUIRED_FIELDS:
+            if field in missing:
                 result.add_error(f"Missing required field: {field}")
     
-    def _validate_structure(self, data: Dict, result: ValidationResult):
+    def _validate_structure(self, data: Mapping, result: ValidationResult) -> None:
         """Validate nested structure"""
         
         # Vendor structure
@@ -112,7 +143,7 @@ class InvoiceValidator:
             elif len(data['line_items']) == 0:
                 result.add_error("Invoice must have at least one line item")
     
-    def _validate_data_types(self, data: Dict, result: ValidationResult):
+    def _validate_data_types(self, data: Mapping, result: ValidationResult) -> None:
         """Validate data types"""
         
         # String fields
@@ -125,26 +156,29 @@ class InvoiceValidator:
         numeric_fields = ['subtotal', 'total_tax', 'total_amount', 
                          'cgst_amount', 'sgst_amount', 'igst_amount']
         for field in numeric_fields:
-            if field in data and data[field] is not None:
-                try:
-                    float(data[field])
-                except (TypeError, ValueError):
-                    result.add_error(f"{field} must be numeric")
+            value = data.get(field)
+            if value is None or isinstance(value, (int, float)):
+                continue
+            try:
+                float(value)
+            except (TypeError, ValueError):
+                result.add_error(f"{field} must be numeric")
     
-    def _validate_business_rules(self, data: Dict, result: ValidationResult):
+    def _validate_business_rules(self, data: Mapping, result: ValidationResult) -> None:
         """Validate business logic rules"""
         
         # Invoice date validation
         if 'invoice_date' in data:
             try:
                 invoice_date = date.fromisoformat(data['invoice_date'])
+                today = date.today()
                 
                 # Check not in future
-                if invoice_date > date.today():
+                if invoice_date > today:
                     result.add_error(f"Invoice date cannot be in future: {invoice_date}")
                 
                 # Check not too old (10 years)
-                if (date.today() - invoice_date).days > 3650:
+                if (today - invoice_date).days > 3650:
                     result.add_error(f"Invoice date too old: {invoice_date}")
                     
             except (ValueError, TypeError) as e:
@@ -153,7 +187,9 @@ class InvoiceValidator:
         # Amount validations
         if 'total_amount' in data:
             try:
-                total = float(data['total_amount'])
+                total = data['total_amount']
+                if type(total) is not float:  # ints still convert so messages read e.g. "0.0"
+                    total = float(total)
                 if total <= 0:
                     result.add_error(f"Total amount must be positive: {total}")
                 if total > 1_000_000_000:  # 100 crore limit
@@ -161,28 +197,45 @@ class InvoiceValidator:
             except (TypeError, ValueError):
                 pass  # Already caught in data type validation
     
-    def _validate_gstins(self, data: Dict, result: ValidationResult):
+    def _validate_gstins(self, data: Mapping, result: ValidationResult) -> None:
         """Validate GSTIN formats"""
         
         # Seller GSTIN
         if 'vendor' in data and isinstance(data['vendor'], dict):
             seller_gstin = data['vendor'].get('gstin', '')
-            if seller_gstin and not self.gstin_pattern.match(seller_gstin):
+            if seller_gstin and not _is_valid_gstin(seller_gstin):
                 result.add_error(f"Invalid seller GSTIN format: {seller_gstin}")
         
         # Buyer GSTIN
         if 'buyer' in data and isinstance(data['buyer'], dict):
             buyer_gstin = data['buyer'].get('gstin', '')
-            if buyer_gstin and not self.gstin_pattern.match(buyer_gstin):
+            if buyer_gstin and not _is_valid_gstin(buyer_gstin):
                 result.add_error(f"Invalid buyer GSTIN format: {buyer_gstin}")
     
-    def _validate_line_items(self, data: Dict, result: ValidationResult):
+    def _validate_line_items(self, data: Mapping, result: ValidationResult) -> None:
         """Validate line items"""
         
         if 'line_items' not in data or not isinstance(data['line_items'], list):
             return
         
-        for i, item in enumerate(data['line_items'], 1):
+        items = data['line_items']
+        
+        # Fast path: long lists of well-formed items are checked column-wise
+        if len(items) >= _VECTORISE_MIN_ITEMS and all(
+            isinstance(item, dict) and 'description' in item for item in items
+        ):
+            try:
+                count = len(items)
+                quantities = np.fromiter((float(item['quantity']) for item in items), dtype=np.float64, count=count)
+                rates = np.fromiter((float(item['rate']) for item in items), dtype=np.float64, count=count)
+                amounts = np.fromiter((float(item['amount']) for item in items), dtype=np.float64, count=count)
+            except (KeyError, TypeError, ValueError):
+                pass  # Missing or non-numeric fields get per-item messages below
+            else:
+                self._validate_line_item_columns(items, quantities, rates, amounts, result)
+                return
+        
+        for i, item in enumerate(items, 1):
             if not isinstance(item, dict):
                 result.add_error(f"Line item {i} must be a dictionary")
                 continue
@@ -221,17 +274,46 @@ class InvoiceValidator:
             # Validate calculation
             if all(k in item for k in ['quantity', 'rate', 'amount']):
                 try:
-                    expected = float(item['quantity']) * float(item['rate'])
-                    actual = float(item['amount'])
-                    if abs(expected - actual) > 0.01:
+                    expected = _to_paise(float(item['quantity']) * float(item['rate']))
+                    actual = _to_paise(float(item['amount']))
+                    if abs(expected - actual) > _PAISE_TOLERANCE:
                         result.add_error(
                             f"Line item {i} calculation error: "
                             f"{item['quantity']} × {item['rate']} ≠ {item['amount']}"
                         )
-                except (TypeError, ValueError):
-                    pass  # Already caught above
+                except (TypeError, ValueError, OverflowError):
+                    pass  # Already caught above (or not a finite amount)
     
-    def _validate_amounts(self, data: Dict, result: ValidationResult):
+    def _validate_line_item_columns(self, items: List[dict], quantities: np.ndarray,
+                                    rates: np.ndarray, amounts: np.ndarray,
+                                    result: ValidationResult) -> None:
+        """Vectorised line item checks; errors match the per-item loop"""
+        
+        with np.errstate(invalid='ignore'):
+            expected = np.rint(quantities * rates * 100)
+            actual = np.rint(amounts * 100)
+            calc_error = (np.abs(expected - actual) > _PAISE_TOLERANCE) & np.isfinite(expected) & np.isfinite(actual)
+            bad_quantity = quantities <= 0
+            bad_rate = rates < 0
+            bad_amount = amounts < 0
+        
+        failing = np.flatnonzero(bad_quantity | bad_rate | bad_amount | calc_error)
+        for idx in failing.tolist():
+            i = idx + 1
+            if bad_quantity[idx]:
+                result.add_error(f"Line item {i} quantity must be positive")
+            if bad_rate[idx]:
+                result.add_error(f"Line item {i} rate cannot be negative")
+            if bad_amount[idx]:
+                result.add_error(f"Line item {i} amount cannot be negative")
+            if calc_error[idx]:
+                item = items[idx]
+                result.add_error(
+                    f"Line item {i} calculation error: "
+                    f"{item['quantity']} × {item['rate']} ≠ {item['amount']}"
+                )
+    
+    def _validate_amounts(self, data: Mapping, result: ValidationResult) -> None:
         """Validate amount consistency"""
         
         try:
@@ -239,9 +321,11 @@ class InvoiceValidator:
             total_tax = float(data.get('total_tax', 0))
             total_amount = float(data.get('total_amount', 0))
             
+            subtotal_p = _to_paise(subtotal)
+            total_tax_p = _to_paise(total_tax)
+            
             # Check total = subtotal + tax
-            expected_total = subtotal + total_tax
-            if abs(expected_total - total_amount) > 0.01:
+            if abs(subtotal_p + total_tax_p - _to_paise(total_amount)) > _PAISE_TOLERANCE:
                 result.add_error(
                     f"Amount mismatch: subtotal ({subtotal}) + tax ({total_tax}) "
                     f"≠ total ({total_amount})"
@@ -254,22 +338,26 @@ class InvoiceValidator:
             cess = float(data.get('cess', 0))
             
             expected_tax = cgst + sgst + igst + cess
-            if abs(expected_tax - total_tax) > 0.01:
+            expected_tax_p = _to_paise(cgst) + _to_paise(sgst) + _to_paise(igst) + _to_paise(cess)
+            if abs(expected_tax_p - total_tax_p) > _PAISE_TOLERANCE:
                 result.add_error(
                     f"Tax mismatch: CGST + SGST + IGST + Cess "
                     f"({expected_tax}) ≠ Total Tax ({total_tax})"
                 )
             
-        except (TypeError, ValueError, KeyError):
+        except (TypeError, ValueError, KeyError, OverflowError):
             pass  # Data type errors already caught
     
-    def validate_safe(self, invoice_data: Dict) -> Tuple[bool, List[str]]:
+    def validate_safe(self, invoice_data: Mapping) -> Tuple[bool, List[str]]:
         """
         Safe validation that never throws exceptions
         
         Returns:
             (is_valid, error_list)
         """
+        if not isinstance(invoice_data, Mapping):
+            return False, [f"Invoice data must be a dictionary, got {type(invoice_data).__name__}"]
+        
         try:
             result = self.validate(invoice_data)
             return result.is_valid, result.errors
@@ -281,7 +369,7 @@ class PydanticValidator:
     """Validates using Pydantic models (fallback validation)"""
     
     @staticmethod
-    def validate_with_model(invoice_data: Dict, model_class: BaseModel) -> Tuple[bool, Optional[str]]:
+    def validate_with_model(invoice_data: Dict, model_class: Type[BaseModel]) -> Tuple[bool, Optional[str]]:
         """
         Validate data against Pydantic model
         
@@ -297,8 +385,12 @@ class PydanticValidator:
             return False, f"Unexpected validation error: {str(e)}"
 
 
+# Stateless, so one shared instance serves every validate_invoice call
+_VALIDATOR = InvoiceValidator()
+
+
 # Convenience function
-def validate_invoice(invoice_data: Dict) -> ValidationResult:
+def validate_invoice(invoice_data: Mapping) -> ValidationResult:
     """
     Quick validation function
     
@@ -309,5 +401,4 @@ def validate_invoice(invoice_data: Dict) -> ValidationResult:
         else:
             print(f"Validation errors: {result.errors}")
     """
-    validator = InvoiceValidator()
-    return validator.validate(invoice_data)
+    return _VALIDATOR.validate(invoice_data)
@@ -0,0 +1,63 @@
+"""
+Line item arithmetic kernels for the arithmetic validator
+
+Numba is optional: when it is installed the kernel is compiled eagerly for its
+one float64 signature (and cached on disk) so the first invoice does not pay
+for JIT compilation; otherwise an equivalent vectorised NumPy implementation
+is used.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: NumPy implementation is used when numba is unavailable
+    njit = None
+
+
+def _line_item_totals_loop(quantities, rates, amounts, tolerance):
+    """Single pass over the line items (compiled by numba)"""
+    
+    count = quantities.shape[0]
+    expected = np.empty(count, dtype=np.float64)
+    mismatched = np.empty(count, dtype=np.bool_)
+    amount_sum = 0.0
+    
+    for i in range(count):
+        expected[i] = quantities[i] * rates[i]
+        mismatched[i] = abs(amounts[i] - expected[i]) > tolerance
+        amount_sum += amounts[i]
+    
+    return expected, mismatched, amount_sum
+
+
+def _line_item_totals_numpy(quantities, rates, amounts, tolerance):
+    """Vectorised NumPy fallback"""
+    
+    expected = quantities * rates
+    mismatched = np.abs(amounts - expected) > tolerance
+    
+    return expected, mismatched, float(np.add.reduce(amounts))
+
+
+# (quantities, rates, amounts, tolerance) -> (expected, mismatched, amount_sum)
+_LINE_ITEM_TOTALS_SIGNATURE = 'Tuple((float64[:], boolean[:], float64))(float64[:], float64[:], float64[:], float64)'
+
+if njit is not None:
+    _line_item_totals = njit(_LINE_ITEM_TOTALS_SIGNATURE, cache=True)(_line_item_totals_loop)
+else:
+    _line_item_totals = _line_item_totals_numpy
+
+
+def line_item_totals(quantities: np.ndarray, rates: np.ndarray, amounts: np.ndarray,
+                     tolerance: float) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Compute per-line expected amounts, mismatch flags and the amount sum
+    
+    Returns:
+        (expected_amounts, mismatched_mask, sum_of_amounts)
+    """
+    expected, mismatched, amount_sum = _line_item_totals(quantities, rates, amounts, tolerance)
+    return expected, mismatched, float(amount_sum)
@@ -3,8 +3,26 @@ Simple arithmetic validator (Category C)
 This is a starter implementation to test the system
 """
 
-from models.invoice import InvoiceData
+from typing import List, Tuple
+
+import numpy as np
+
+from models.invoice import InvoiceData, LineItem
 from models.validation import CheckResult, CategoryResult, CheckStatus, Severity
+from validators._arith_kernels import line_item_totals
+
+# Enum members bound once; EnumType attribute access is measurably slower per check
+_PASS = CheckStatus.PASS
+_FAIL = CheckStatus.FAIL
+_MEDIUM = Severity.MEDIUM
+_HIGH = Severity.HIGH
+_CRITICAL = Severity.CRITICAL
+
+# Shared read-only results for invoices without line items (no arrays, no kernel call)
+_NO_AMOUNTS = np.empty(0, dtype=np.float64)
+_NO_AMOUNTS.flags.writeable = False
+_NO_MISMATCHES = np.empty(0, dtype=np.bool_)
+_NO_MISMATCHES.flags.writeable = False
 
 
 class ArithmeticValidator:
@@ -19,19 +37,70 @@ class ArithmeticValidator:
     async def validate(self, invoice_data: InvoiceData, state=None) -> CategoryResult:
         """Execute arithmetic validation checks"""
         
+        if not invoice_data.line_items:
+            return self._category_result(invoice_data, _NO_AMOUNTS, _NO_MISMATCHES, _NO_AMOUNTS, 0.0)
+        
+        # Line item columns, built once and shared by C1/C2
+        quantities, rates, amounts = self._line_item_columns(invoice_data.line_items)
+        expected, mismatched, amount_sum = line_item_totals(quantities, rates, amounts, 1.0)  # ₹1 tolerance
+        
+        return self._category_result(invoice_data, expected, mismatched, amounts, amount_sum)
+    
+    async def validate_batch(self, invoices: List[InvoiceData]) -> List[CategoryResult]:
+        """
+        Execute arithmetic validation checks for many invoices at once
+        
+        Line items from every invoice are concatenated so the C1 kernel runs
+        once for the whole batch. Results keep the input order.
+        """
+        
+        all_items = [item for invoice in invoices for item in invoice.line_items]
+        quantities, rates, amounts = self._line_item_columns(all_items)
+        expected, mismatched, _ = line_item_totals(quantities, rates, amounts, 1.0)  # ₹1 tolerance
+        
+        results = []
+        start = 0
+        for invoice in invoices:
+            end = start + len(invoice.line_items)
+            invoice_amounts = amounts[start:end]
+            results.append(self._category_result(
+                invoice,
+                expected[start:end],
+                mismatched[start:end],
+                invoice_amounts,
+                float(np.add.reduce(invoice_amounts))
+            ))
+            start = end
+        
+        return results
+    
+    @staticmethod
+    def _line_item_columns(line_items: List[LineItem]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Quantity, rate and amount columns as float64 arrays"""
+        
+        count = len(line_items)
+        quantities = np.fromiter((item.quantity for item in line_items), dtype=np.float64, count=count)
+        rates = np.fromiter((item.rate for item in line_items), dtype=np.float64, count=count)
+        amounts = np.fromiter((item.amount for item in line_items), dtype=np.float64, count=count)
+        return quantities, rates, amounts
+    
+    def _category_result(self, invoice_data: InvoiceData, expected: np.ndarray, mismatched: np.ndarray,
+                         amounts: np.ndarray, amount_sum: float) -> CategoryResult:
+        """Run the category C checks on precomputed line item results"""
+        
         checks = []
         
         # C1: Line item quantity x rate = amount
-        checks.append(await self._check_c1_line_item_amounts(invoice_data))
+        checks.append(self._check_c1_line_item_amounts(expected, mismatched, amounts))
         
         # C2: Subtotal matches sum of line items
-        checks.append(await self._check_c2_subtotal(invoice_data))
+        checks.append(self._check_c2_subtotal(invoice_data, amount_sum))
         
         # C3: Tax calculation accuracy
-        checks.append(await self._check_c3_tax_calculation(invoice_data))
+        checks.append(self._check_c3_tax_calculation(invoice_data))
         
         # C10: Total amount
-        checks.append(await self._check_c10_total_amount(invoice_data))
+        checks.append(self._check_c10_total_amount(invoice_data))
         
         return CategoryResult(
             category='C',
@@ -39,62 +108,58 @@ class ArithmeticValidator:
             checks=checks
         )
     
-    async def _check_c1_line_item_amounts(self, invoice_data: InvoiceData) -> CheckResult:
+    def _check_c1_line_item_amounts(self, expected: np.ndarray, mismatched: np.ndarray,
+                                    amounts: np.ndarray) -> CheckResult:
         """C1: Line item quantity x rate = amount"""
         
-        errors = []
-        
-        for idx, item in enumerate(invoice_data.line_items, 1):
-            expected = item.quantity * item.rate
-            if abs(item.amount - expected) > 1.0:  # ₹1 tolerance
-                errors.append(
-                    f"Line {idx}: Expected ₹{expected:.2f}, got ₹{item.amount:.2f}"
-                )
+        errors = [
+            f"Line {idx + 1}: Expected ₹{expected[idx]:.2f}, got ₹{amounts[idx]:.2f}"
+            for idx in np.flatnonzero(mismatched)
+        ]
         
         if not errors:
             return CheckResult(
                 check_id='C1',
                 check_name='Line Item Amount Calculation',
-                status=CheckStatus.PASS,
+                status=_PASS,
                 confidence=1.0,
                 reasoning='All line item amounts calculated correctly',
-                severity=Severity.MEDIUM
+                severity=_MEDIUM
             )
         else:
             return CheckResult(
                 check_id='C1',
                 check_name='Line Item Amount Calculation',
-                status=CheckStatus.FAIL,
+                status=_FAIL,
                 confidence=1.0,
                 reasoning='; '.join(errors),
-                severity=Severity.HIGH
+                severity=_HIGH
             )
     
-    async def _check_c2_subtotal(self, invoice_data: InvoiceData) -> CheckResult:
+    def _check_c2_subtotal(self, invoice_data: InvoiceData, calculated_subtotal: float) -> CheckResult:
         """C2: Subtotal matches sum of line items"""
         
-        calculated_subtotal = sum(item.amount for item in invoice_data.line_items)
         
         if abs(calculated_subtotal - invoice_data.subtotal) <= 1.0:
             return CheckResult(
                 check_id='C2',
                 check_name='Subtotal Matches Line Items',
-                status=CheckStatus.PASS,
+                status=_PASS,
                 confidence=1.0,
                 reasoning=f'Subtotal ₹{invoice_data.subtotal:.2f} matches sum of line items',
-                severity=Severity.MEDIUM
+                severity=_MEDIUM
             )
         else:
             return CheckResult(
                 check_id='C2',
                 check_name='Subtotal Matches Line Items',
-                status=CheckStatus.FAIL,
+                status=_FAIL,
                 confidence=1.0,
                 reasoning=f'Subtotal mismatch: Expected ₹{calculated_subtotal:.2f}, got ₹{invoice_data.subtotal:.2f}',
-                severity=Severity.HIGH
+                severity=_HIGH
             )
     
-    async def _check_c3_tax_calculation(self, invoice_data: InvoiceData) -> CheckResult:
+    def _check_c3_tax_calculation(self, invoice_data: InvoiceData) -> CheckResult:
         """C3: Tax calculation accuracy"""
         
         calculated_tax = (invoice_data.cgst_amount or 0) + \
@@ -106,22 +171,22 @@ class ArithmeticValidator:
             return CheckResult(
                 check_id='C3',
                 check_name='Tax Calculation Accuracy',
-                status=CheckStatus.PASS,
+                status=_PASS,
                 confidence=1.0,
                 reasoning=f'Total tax ₹{invoice_data.total_tax:.2f} calculated correctly',
-                severity=Severity.HIGH
+                severity=_HIGH
             )
         else:
             return CheckResult(
                 check_id='C3',
                 check_name='Tax Calculation Accuracy',
-                status=CheckStatus.FAIL,
+                status=_FAIL,
                 confidence=1.0,
                 reasoning=f'Tax mismatch: Expected ₹{calculated_tax:.2f}, got ₹{invoice_data.total_tax:.2f}',
-                severity=Severity.CRITICAL
+                severity=_CRITICAL
             )
     
-    async def _check_c10_total_amount(self, invoice_data: InvoiceData) -> CheckResult:
+    def _check_c10_total_amount(self, invoice_data: InvoiceData) -> CheckResult:
         """C10: Total amount = subtotal + tax"""
         
         calculated_total = invoice_data.subtotal + invoice_data.total_tax
@@ -130,17 +195,17 @@ class ArithmeticValidator:
             return CheckResult(
                 check_id='C10',
                 check_name='Total Amount Calculation',
-                status=CheckStatus.PASS,
+                status=_PASS,
                 confidence=1.0,
                 reasoning=f'Total amount ₹{invoice_data.total_amount:.2f} calculated correctly',
-                severity=Severity.CRITICAL
+                severity=_CRITICAL
             )
         else:
             return CheckResult(
                 check_id='C10',
                 check_name='Total Amount Calculation',
-                status=CheckStatus.FAIL,
+                status=_FAIL,
                 confidence=1.0,
                 reasoning=f'Total mismatch: Expected ₹{calculated_total:.2f}, got ₹{invoice_data.total_amount:.2f}',
-                severity=Severity.CRITICAL
+                severity=_CRITICAL
             )
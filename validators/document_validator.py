@@ -10,6 +10,11 @@ from models.invoice import InvoiceData
 from models.validation import CheckResult, CategoryResult, CheckStatus, Severity
 from utils.data_loaders import VendorRegistry
 
+# Compiled once at import: A1 allowed characters (alphanumeric, dash, slash, underscore)
+_VALID_INVOICE_RE = re.compile(r'^[A-Za-z0-9\-/_]+$')
+# A3 numeric runs within invoice numbers
+_DIGITS_RE = re.compile(r'\d+')
+
 
 class DocumentValidator:
     """
@@ -113,8 +118,7 @@ class DocumentValidator:
             )
         
         # Check for valid characters (alphanumeric, dash, slash, underscore)
-        valid_pattern = r'^[A-Za-z0-9\-/_]+$'
-        if not re.match(valid_pattern, invoice_num):
+        if not _VALID_INVOICE_RE.match(invoice_num):
             return CheckResult(
                 check_id='A1',
                 check_name='Invoice Number Format',
@@ -225,7 +229,7 @@ class DocumentValidator:
         seller_gstin = invoice_data.seller_gstin
         
         # Extract numeric component from invoice number
-        numbers = re.findall(r'\d+', invoice_num)
+        numbers = _DIGITS_RE.findall(invoice_num)
         if not numbers:
             return CheckResult(
                 check_id='A3',
@@ -260,7 +264,7 @@ class DocumentValidator:
         # Extract sequence numbers from previous invoices
         previous_sequences = []
         for inv in vendor_invoices:
-            prev_numbers = re.findall(r'\d+', inv['invoice_num'])
+            prev_numbers = _DIGITS_RE.findall(inv['invoice_num'])
             if prev_numbers:
                 previous_sequences.append(int(prev_numbers[-1]))
         